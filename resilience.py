@@ -1,78 +1,166 @@
 
+import functools
 import re
+import sys
 from typing import List, Optional, Tuple, Union
 
-# Token types for lexing
+# Lexing is split in two. Fixed-string tokens are dispatched on their first
+# character without the regex engine; only the variable-length tokens in
+# TOKEN_TYPES go through the fused regex. A new token belongs in exactly one
+# of these tables.
+SINGLE_CHAR_TOKENS = {
+    '[': 'LBRACKET',
+    ']': 'RBRACKET',
+    '(': 'LPAREN',
+    ')': 'RPAREN',
+    '&': 'AND',
+    '|': 'OR',
+    '!': 'NOT',
+    '=': 'EQUALS',
+    '*': 'STAR',
+    '+': 'PLUS',
+    '?': 'QUESTION',
+    '@': 'AT',
+    ':': 'COLON',
+    '^': 'START_ASSERT',
+    '$': 'END_ASSERT',
+}
+# Tokens starting with '(?', keyed by their third character; checked before SINGLE_CHAR_TOKENS
+GROUP_START_TOKENS = {
+    '<': 'CAPTURE_START',
+    '=': 'LOOKAHEAD_START',
+    '!': 'LOOKAHEAD_START',
+}
+# Variable-length tokens, fused into one alternation in this order. Alternation is
+# leftmost-first, so an earlier pattern wins when two match at the same position.
+# WORD tokens are lexed as STRING and reclassified by FIELD_NAMES. Patterns must not
+# contain capturing groups (use (?:...)): tokens are labelled by Match.lastindex.
 TOKEN_TYPES = {
     'WHITESPACE': r'\s+',
-    'LBRACKET': r'\[',
-    'RBRACKET': r'\]',
-    'LPAREN': r'\(',
-    'RPAREN': r'\)',
-    'AND': r'&',
-    'OR': r'\|',
-    'NOT': r'!',
-    'EQUALS': r'=',
-    'STAR': r'\*',
-    'PLUS': r'\+',
-    'QUESTION': r'\?',
-    'WORD': r'word|lemma|tag|entity|chunk|incoming|outgoing|mention',
     'STRING': r'\".*?\"|\'.*?\'|\w+',
     'NUMBER': r'\d+',
-    'AT': r'@',
-    'COLON': r':',
-    'CAPTURE_START': r'\(\?<',
-    'CAPTURE_END': r'\)',
-    'START_ASSERT': r'\^',
-    'END_ASSERT': r'\$',
-    'LOOKAHEAD_START': r'\(\?=|\(\?!',
-    'LOOKAHEAD_END': r'\)',
-    # Add any other necessary tokens here
 }
+# Identifiers that name a token field; a whole \w+ run equal to one of these is a WORD
+FIELD_NAMES = frozenset(('word', 'lemma', 'tag', 'entity', 'chunk', 'incoming', 'outgoing', 'mention'))
+# The matching group of MASTER_RE names the token type
+REGEX_TOKENS = tuple(TOKEN_TYPES)
+MASTER_RE = re.compile('|'.join(f'(?P<{name}>{TOKEN_TYPES[name]})' for name in REGEX_TOKENS))
+# Interned token type per MASTER_RE group number. Match.lastgroup returns the group
+# name as stored in the compiled pattern, which is uninterned, so the parser's ==
+# checks against literals could not take the identity shortcut.
+REGEX_TOKEN_TYPES = (None,) + tuple(sys.intern(name) for name in REGEX_TOKENS)
+assert MASTER_RE.groups == len(REGEX_TOKENS), "TOKEN_TYPES patterns must not contain capturing groups"
+
+# Token types of the pattern quantifiers
+QUANTIFIER_TYPES = frozenset(('STAR', 'PLUS', 'QUESTION'))
+
+# Binding strength of the binary constraint operators
+CONSTRAINT_PRECEDENCE = {'OR': 1, 'AND': 2}
 
 # Types for tokens and parsed elements
 Token = Tuple[str, str]
-ASTNode = Union[str, Tuple, List]
+ASTNode = Union[str, Tuple]
+
+@functools.lru_cache(maxsize=1024)
+def tokenize(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # Returns the token types and lexemes of text as parallel tuples. Results are
+    # cached, since the same pattern strings tend to be lexed over and over.
+    types: List[str] = []
+    lexemes: List[str] = []
+    add_type = types.append
+    add_lexeme = lexemes.append
+    end = len(text)
+    pos = 0
+    # Module-level tables are bound to locals once, so the loop reads them with LOAD_FAST
+    match_token = MASTER_RE.match
+    single_char_type = SINGLE_CHAR_TOKENS.get
+    group_start_type = GROUP_START_TOKENS.get
+    regex_types = REGEX_TOKEN_TYPES
+    field_names = FIELD_NAMES
+    while pos < end:
+        char = text[pos]
+        if char == '(' and text.startswith('(?', pos):
+            token_type = group_start_type(text[pos + 2:pos + 3])
+            if token_type is not None:
+                add_type(token_type)
+                add_lexeme(text[pos:pos + 3])
+                pos += 3
+                continue
+        token_type = single_char_type(char)
+        if token_type is not None:
+            add_type(token_type)
+            add_lexeme(char)
+            pos += 1
+            continue
+        match = match_token(text, pos)
+        if match is None:
+            raise SyntaxError(f"Unknown character: {char}")
+        token_type = regex_types[match.lastindex]
+        # Skip whitespace tokens, do not add them to the token list
+        if token_type != 'WHITESPACE':
+            lexeme = match.group()
+            if lexeme in field_names:
+                token_type = 'WORD'
+            add_type(token_type)
+            add_lexeme(lexeme)
+        pos = match.end()
+    return tuple(types), tuple(lexemes)
 
 # Lexer for breaking input into tokens
 class Lexer:
+    __slots__ = ('text', 'types', 'lexemes', 'n_tokens', 'pos')
+
     def __init__(self, text: str) -> None:
         self.text = text
-        self.tokens: List[Token] = []
-        self.tokenize()
-
-    def tokenize(self) -> None:
-        pos = 0
-        while pos < len(self.text):
-            match = None
-            for token_type, regex in TOKEN_TYPES.items():
-                pattern = re.compile(regex)
-                match = pattern.match(self.text, pos)
-                if match:
-                    # Skip whitespace tokens, do not add them to the token list
-                    if token_type != 'WHITESPACE':
-                        self.tokens.append((token_type, match.group()))
-                    pos = match.end()
-                    break
-            if not match:
-                raise SyntaxError(f"Unknown character: {self.text[pos]}")
-    
+        # Token types and lexemes are kept in parallel tuples rather than as (type, lexeme) pairs
+        self.types, self.lexemes = tokenize(text)
+        self.n_tokens = len(self.types)
+        self.pos = 0
+
+    @property
+    def tokens(self) -> Tuple[Token, ...]:
+        return tuple(zip(self.types, self.lexemes))
+
     def next_token(self) -> Optional[Token]:
-        return self.tokens.pop(0) if self.tokens else None
+        # Kept for external callers; the parsers do not use it. pos only records
+        # tokens taken through next_token and does not follow parser progress.
+        # Advance a cursor rather than pop(0), which shifts the whole list
+        pos = self.pos
+        token = (self.types[pos], self.lexemes[pos]) if pos < self.n_tokens else None
+        self.pos = pos + 1
+        return token
 
 # Parser for Token Constraints and Patterns
 class TokenConstraintParser:
+    __slots__ = ('lexer', 'types', 'lexemes', 'n_tokens', 'pos', 'cur_type')
+
     def __init__(self, lexer: Lexer) -> None:
         self.lexer = lexer
-        self.current_token: Optional[Token] = self.lexer.next_token()
+        # Read the lexer's parallel lists directly, starting at its current position,
+        # with a cursor of our own; lexer.pos is not advanced as tokens are eaten.
+        # Lexemes are only looked up when a node needs one.
+        self.types = lexer.types
+        self.lexemes = lexer.lexemes
+        self.n_tokens = lexer.n_tokens
+        self.pos = lexer.pos
+        self.cur_type: Optional[str] = self.types[self.pos] if self.pos < self.n_tokens else None
 
     def eat(self, token_type: str) -> None:
-        if self.current_token and self.current_token[0] == token_type:
-            self.current_token = self.lexer.next_token()
-        else:
-            expected = token_type
-            got = self.current_token[0] if self.current_token else 'EOF'
-            raise SyntaxError(f"Expected {expected} but got {got}")
+        if self.cur_type == token_type:
+            pos = self.pos + 1
+            self.pos = pos
+            self.cur_type = self.types[pos] if pos < self.n_tokens else None
+            return
+        raise self._expected_error(token_type)
+
+    # Error construction lives out of line so the hot methods stay short
+    def _expected_error(self, expected: str) -> SyntaxError:
+        got = self.cur_type or 'EOF'
+        return SyntaxError(f"Expected {expected} but got {got}")
+
+    def _unexpected_error(self, rule: str) -> SyntaxError:
+        got = self.lexemes[self.pos] if self.cur_type is not None else 'EOF'
+        return SyntaxError(f"Unexpected token '{got}' in {rule}")
 
     def parse(self) -> Optional[ASTNode]:
         return self.token_constraint()
@@ -81,52 +169,44 @@ class TokenConstraintParser:
         # TokenConstraint ::= ‘[’ [DisjunctiveConstraint] ‘]’
         self.eat('LBRACKET')
         constraint = None
-        if self.current_token and self.current_token[0] != 'RBRACKET':
-            constraint = self.disjunctive_constraint()
+        if self.cur_type is not None and self.cur_type != 'RBRACKET':
+            constraint = self.constraint_expression()
         self.eat('RBRACKET')
         return constraint
 
-    def disjunctive_constraint(self) -> ASTNode:
+    def constraint_expression(self, min_precedence: int = 1) -> ASTNode:
         # DisjunctiveConstraint ::= ConjunctiveConstraint ( ‘|’ ConjunctiveConstraint )*
-        left = self.conjunctive_constraint()
-        while self.current_token and self.current_token[0] == 'OR':
-            self.eat('OR')
-            right = self.conjunctive_constraint()
-            left = ('OR', left, right)
-        return left
-
-    def conjunctive_constraint(self) -> ASTNode:
         # ConjunctiveConstraint ::= NegatedConstraint ( ‘&’ NegatedConstraint )*
-        left = self.negated_constraint()
-        while self.current_token and self.current_token[0] == 'AND':
-            self.eat('AND')
-            right = self.negated_constraint()
-            left = ('AND', left, right)
+        # Both levels are parsed by precedence climbing; operators are left-associative
+        left = self.constraint_atom()
+        precedence = CONSTRAINT_PRECEDENCE.get(self.cur_type)
+        while precedence is not None and precedence >= min_precedence:
+            operator = self.cur_type
+            self.eat(operator)
+            right = self.constraint_expression(precedence + 1)
+            left = (operator, left, right)
+            precedence = CONSTRAINT_PRECEDENCE.get(self.cur_type)
         return left
 
-    def negated_constraint(self) -> ASTNode:
+    def constraint_atom(self) -> ASTNode:
         # NegatedConstraint ::= [ ‘!’ ] AtomicConstraint
-        if self.current_token and self.current_token[0] == 'NOT':
-            self.eat('NOT')
-            return ('NOT', self.atomic_constraint())
-        else:
-            return self.atomic_constraint()
-
-    def atomic_constraint(self) -> ASTNode:
         # AtomicConstraint ::= FieldConstraint | ‘(’ DisjunctiveConstraint ‘)’
-        if self.current_token and self.current_token[0] == 'WORD':
-            return self.field_constraint()
-        elif self.current_token and self.current_token[0] == 'LPAREN':
+        negated = self.cur_type == 'NOT'
+        if negated:
+            self.eat('NOT')
+        if self.cur_type == 'WORD':
+            atom = self.field_constraint()
+        elif self.cur_type == 'LPAREN':
             self.eat('LPAREN')
-            disjunction = self.disjunctive_constraint()
+            atom = self.constraint_expression()
             self.eat('RPAREN')
-            return disjunction
         else:
             raise SyntaxError("Expected FieldConstraint or nested DisjunctiveConstraint")
+        return ('NOT', atom) if negated else atom
 
     def field_constraint(self) -> ASTNode:
         # FieldConstraint ::= FieldName ‘=’ StringMatcher
-        field_name = self.current_token[1]
+        field_name = self.lexemes[self.pos]
         self.eat('WORD')
         self.eat('EQUALS')
         string_matcher = self.string_matcher()
@@ -134,8 +214,8 @@ class TokenConstraintParser:
 
     def string_matcher(self) -> ASTNode:
         # StringMatcher ::= ExactStringMatcher | RegexStringMatcher
-        if self.current_token and self.current_token[0] == 'STRING':
-            literal = self.current_token[1]
+        if self.cur_type == 'STRING':
+            literal = self.lexemes[self.pos]
             self.eat('STRING')
             return ('EXACT', literal)
         else:
@@ -143,13 +223,26 @@ class TokenConstraintParser:
 
 # Token Pattern Parser
 class TokenPatternParser(TokenConstraintParser):
+    __slots__ = ()
+
+    # Name of the AtomicTokenPattern rule method for each token type that can start
+    # one, dispatched with a single lookup instead of an if/elif chain. Methods are
+    # looked up by name on self, so subclasses can override any rule.
+    ATOMIC_PATTERN_RULES = {
+        'WORD': 'field_constraint',
+        'LBRACKET': 'token_constraint',
+        'LPAREN': 'nested_token_pattern',
+        'AT': 'mention_token_pattern',
+        'CAPTURE_START': 'capture_token_pattern',
+    }
+
     def parse_token_pattern(self) -> ASTNode:
         return self.disjunctive_token_pattern()
 
     def disjunctive_token_pattern(self) -> ASTNode:
         # DisjunctiveTokenPattern ::= ConcatenatedTokenPattern ( ‘|’ ConcatenatedTokenPattern )*
         left = self.concatenated_token_pattern()
-        while self.current_token and self.current_token[0] == 'OR':
+        while self.cur_type == 'OR':
             self.eat('OR')
             right = self.concatenated_token_pattern()
             left = ('OR', left, right)
@@ -158,44 +251,40 @@ class TokenPatternParser(TokenConstraintParser):
     def concatenated_token_pattern(self) -> ASTNode:
         # ConcatenatedTokenPattern ::= QuantifiedTokenPattern QuantifiedTokenPattern*
         patterns = [self.quantified_token_pattern()]
-        while self.current_token and self.current_token[0] in ('WORD', 'LPAREN', 'AT', 'CAPTURE_START', 'LBRACKET'):
+        while self.cur_type in self.ATOMIC_PATTERN_RULES:
             patterns.append(self.quantified_token_pattern())
         if len(patterns) == 1:
             return patterns[0]
         else:
-            return ('SEQ', patterns)
+            return ('SEQ', tuple(patterns))
 
     def quantified_token_pattern(self) -> ASTNode:
         # QuantifiedTokenPattern ::= AtomicTokenPattern [Quantifier]
         atom = self.atomic_token_pattern()
-        if self.current_token and self.current_token[0] in ('STAR', 'PLUS', 'QUESTION'):
-            quantifier = self.current_token[1]
-            self.eat(self.current_token[0])
+        if self.cur_type in QUANTIFIER_TYPES:
+            quantifier = self.lexemes[self.pos]
+            self.eat(self.cur_type)
             return ('QUANT', atom, quantifier)
         return atom
 
     def atomic_token_pattern(self) -> ASTNode:
         # AtomicTokenPattern ::= SingleTokenPattern | MentionTokenPattern | CaptureTokenPattern | AssertionTokenPattern
-        if self.current_token and self.current_token[0] == 'WORD':
-            return self.field_constraint()
-        elif self.current_token and self.current_token[0] == 'LBRACKET':
-            return self.token_constraint()
-        elif self.current_token and self.current_token[0] == 'LPAREN':
-            self.eat('LPAREN')
-            pattern = self.disjunctive_token_pattern()
-            self.eat('RPAREN')
-            return pattern
-        elif self.current_token and self.current_token[0] == 'AT':
-            return self.mention_token_pattern()
-        elif self.current_token and self.current_token[0] == 'CAPTURE_START':
-            return self.capture_token_pattern()
-        else:
-            raise SyntaxError(f"Unexpected token '{self.current_token[1] if self.current_token else 'EOF'}' in AtomicTokenPattern")
+        rule = self.ATOMIC_PATTERN_RULES.get(self.cur_type)
+        if rule is None:
+            raise self._unexpected_error('AtomicTokenPattern')
+        return getattr(self, rule)()
+
+    def nested_token_pattern(self) -> ASTNode:
+        # ‘(’ DisjunctiveTokenPattern ‘)’
+        self.eat('LPAREN')
+        pattern = self.disjunctive_token_pattern()
+        self.eat('RPAREN')
+        return pattern
 
     def mention_token_pattern(self) -> ASTNode:
         # MentionTokenPattern ::= ‘@’ [ StringLiteral ‘:’ ] ExactStringMatcher
         self.eat('AT')
-        if self.current_token and self.current_token[0] == 'STRING':
+        if self.cur_type == 'STRING':
             mention = self.string_matcher()
         else:
             mention = None
@@ -204,12 +293,19 @@ class TokenPatternParser(TokenConstraintParser):
     def capture_token_pattern(self) -> ASTNode:
         # CaptureTokenPattern ::= ‘(?<’ identifier ‘>’ DisjunctiveTokenPattern ‘)’
         self.eat('CAPTURE_START')
-        capture_name = self.current_token[1]
+        name_pos = self.pos
         self.eat('STRING')  # identifier
+        capture_name = self.lexemes[name_pos]
         self.eat('CAPTURE_END')
         pattern = self.disjunctive_token_pattern()
         return ('CAPTURE', capture_name, pattern)
 
+@functools.lru_cache(maxsize=1024)
+def parse_pattern(text: str) -> ASTNode:
+    # Parses text as a token pattern. Results are cached, so callers share the
+    # returned AST, which is built only from tuples and strings.
+    return TokenPatternParser(Lexer(text)).parse_token_pattern()
+
 # Example usage
 if __name__ == "__main__":
     text = '[word="hello" & lemma="greet"] | @Person'